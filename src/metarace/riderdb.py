@@ -410,7 +410,13 @@ _TEAM_SCHEMA = {
 }
 
 # reserved series
-_RESERVED_SERIES = ('spare', 'cat', 'team', 'ds', 'series')
+_RESERVED_SERIES = frozenset(('spare', 'cat', 'team', 'ds', 'series'))
+
+# series saved in the category section of a riders file
+_CATEGORY_SERIES = frozenset(('cat', 'series'))
+
+# columns that invalidate cached name strings
+_NAME_KEYS = frozenset(('no', 'series', 'first', 'last', 'org'))
 
 # legacy csv file ordering
 _DEFAULT_COLUMN_ORDER = ('no', 'first', 'last', 'org', 'cat', 'series', 'ref',
@@ -428,6 +434,8 @@ def primary_cat(catstr=''):
 
 def colkey(colstr=''):
     """Convert a column header string to a colkey."""
+    if colstr in _RIDER_COLUMNS:  # already a colkey
+        return colstr
     col = colstr[0:4].strip().lower()
     if col in _ALT_COLUMNS:
         col = _ALT_COLUMNS[col]
@@ -447,6 +455,8 @@ def cellnorm(unistr):
 class rider():
     """Rider handle."""
 
+    __slots__ = ('__strcache', '__store', '__notify')
+
     def get_id(self):
         """Return this rider's unique id"""
         return (self.__store['no'].upper(), self.__store['series'].lower())
@@ -525,13 +535,18 @@ class rider():
         """Update a value without triggering notify."""
         key = colkey(key)
         self.__store[key] = value
-        if key in ['no', 'series', 'first', 'last', 'org']:
+        if key in _NAME_KEYS:
             self.__strcache = {}
 
     def notify(self):
         """Forced notify."""
         self.__notify(self.get_id())
 
+    def reset(self, no='', series=''):
+        """Clear all values without triggering notify."""
+        self.__strcache = {}
+        self.__store = {'no': no, 'series': series}
+
     def __init__(self, cols={}, no='', series='', notify=None):
         self.__strcache = {}
         self.__store = dict(cols)
@@ -613,48 +628,8 @@ class rider():
                     else:
                         ret = grapheme.slice(ret, end=width)
             else:
-                fn = self['first'].strip().title()
-                fl = grapheme.length(fn)
-                ln = self['last'].strip().upper()
-                ll = grapheme.length(ln)
-                flen = fl + ll
-                if fl and ll:
-                    flen += 1
-                if flen > width:
-                    lshrt = ln.split('-')[-1].strip()
-                    lsl = grapheme.length(lshrt)
-                    flen = fl + lsl
-                    if fl and lsl:
-                        flen += 1
-                    if flen > width and ln:
-                        if fl > 2:
-                            fshrt = grapheme.slice(fn, end=1) + '.'
-                            fn = fshrt
-                            fsl = 2
-                            flen = fsl + ll
-                            if fsl and ll:
-                                flen += 1
-                            if flen > width:
-                                ln = lshrt
-                                flen = fsl + lsl
-                                if fsl and lsl:
-                                    flen += 1
-                                if flen > width:
-                                    if lsl <= width:
-                                        fn = ''
-                    else:
-                        ln = lshrt
-                if fn and ln:
-                    ret = ' '.join((fn, ln))
-                elif fn:
-                    ret = fn
-                else:
-                    ret = ln
-                if trunc and grapheme.length(ret) > width:
-                    if width > 4:
-                        ret = grapheme.slice(ret, end=width - 1) + '\u2026'
-                    else:
-                        ret = grapheme.slice(ret, end=width)
+                ret = strops.fitname(self['first'], self['last'], width,
+                                     trunc)
             self.__strcache[nkey] = ret
         else:
             ret = self.__strcache[nkey]
@@ -684,14 +659,14 @@ class rider():
     def __setitem__(self, key, value):
         key = colkey(key)
         self.__store[key] = value
-        if key in ['no', 'series', 'first', 'last', 'org']:
+        if key in _NAME_KEYS:
             self.__strcache = {}
         self.__notify(self.get_id())
 
     def __delitem__(self, key):
         key = colkey(key)
         del (self.__store[key])
-        if key in ['no', 'series', 'first', 'last', 'org']:
+        if key in _NAME_KEYS:
             self.__strcache = {}
         self.__notify(self.get_id())
 
@@ -734,23 +709,27 @@ class riderdb():
             self.__notify(rid)
         return rid
 
-    def __loadrow(self, r, colspec):
-        nr = rider()
-        for i in range(0, len(colspec)):
-            if len(r) > i:  # column data in row
-                key = colspec[i]
-                val = cellnorm(r[i])
-                if key == 'series':
-                    val = val.lower()
-                nr[key] = val
+    def __loadrow_into(self, nr, r, colspec):
+        """Fill rider nr from row r, return False for a header row."""
+        for key, cell in zip(colspec, r):
+            val = cellnorm(cell)
+            if key == 'series':
+                val = val.lower()
+            nr.set_value(key, val)
         if nr['no']:
             if colkey(nr['no']) in _RIDER_COLUMNS:
                 _log.debug('Ignore column header: %r', r)
-                return None
+                return False
         else:
             if nr['series'] != 'series':
                 _log.warning('Rider without number: %r', nr)
-        return nr
+        return True
+
+    def __loadrow(self, r, colspec):
+        nr = rider()
+        if self.__loadrow_into(nr, r, colspec):
+            return nr
+        return None
 
     def load(self, csvfile=None, overwrite=False):
         """Load riders from supplied CSV file."""
@@ -805,12 +784,7 @@ class riderdb():
             if rser == 'series':
                 defined.append(r['no'])
                 seen.add(r['no'])
-            elif rser not in (
-                    'cat',
-                    'spare',
-                    'ds',
-                    'team',
-            ):
+            elif rser not in _RESERVED_SERIES:
                 if rser not in seen:
                     anonymous.append(rser)
                     seen.add(rser)
@@ -854,49 +828,52 @@ class riderdb():
             columns = self.include_cols
         with metarace.savefile(csvfile) as f:
             cr = csv.writer(f, quoting=csv.QUOTE_ALL)
-            cr.writerow(get_header(columns))
+            writerow = cr.writerow
+            writerow(get_header(columns))
             for r in self.__store.values():
-                if r['series'] in (
-                        'cat',
-                        'series',
-                ):
+                if r['series'] in _CATEGORY_SERIES:
                     cats.append(r)
                 else:
-                    cr.writerow(r.get_row(columns))
+                    writerow(r.get_row(columns))
 
             if cats:
-                cr.writerow(get_header(columns, _CATEGORY_COLUMNS))
+                writerow(get_header(columns, _CATEGORY_COLUMNS))
                 for r in cats:
-                    cr.writerow(r.get_row(columns))
+                    writerow(r.get_row(columns))
 
     def load_chipfile(self, csvfile=None):
         """Load refids into model from CSV file"""
         _log.debug('Loading refids from %r', csvfile)
         count = 0
+        updates = {}
+        nr = rider()  # staging rider, reused for each row
         with open(csvfile, 'r', encoding='utf-8', errors='replace') as f:
             cr = csv.reader(f)
             incols = None  # no header
             for r in cr:
-                nr = None
+                found = False
                 if len(r) > 0:  # got a data row
-                    if incols is not None:  # already got col header
-                        nr = self.__loadrow(r, incols)
-                    else:
+                    if incols is None:
                         # determine input column structure
                         if colkey(r[0]) in _RIDER_COLUMNS:
                             incols = []
                             for col in r:
                                 incols.append(colkey(col))
+                            continue
                         else:
                             incols = _DEFAULT_COLUMN_ORDER  # assume full
-                            nr = self.__loadrow(r, incols)
-                if nr is not None:
+                    nr.reset()
+                    found = self.__loadrow_into(nr, r, incols)
+                if found:
                     if nr['refid'] and nr['series'] not in _RESERVED_SERIES:
-                        lr = self.get_rider(nr['no'], nr['series'])
-                        if lr is not None:
-                            if nr['refid'] != lr['refid']:
-                                lr['refid'] = nr['refid']
-                                count += 1
+                        updates[nr.get_id()] = nr['refid']
+
+        # apply collected refids in a single pass over the model
+        for rid, lr in self.__store.items():
+            refid = updates.get(rid)
+            if refid and refid != lr['refid']:
+                lr['refid'] = refid
+                count += 1
         if count > 0:
             self.__notify(None)
         return count
@@ -908,12 +885,13 @@ class riderdb():
         count = 0
         with metarace.savefile(csvfile) as f:
             cr = csv.writer(f, quoting=csv.QUOTE_ALL)
-            cr.writerow(get_header(columns))
+            writerow = cr.writerow
+            writerow(get_header(columns))
             for r in self.__store.values():
-                if r['series'] not in _RESERVED_SERIES:
-                    if r['refid']:
-                        cr.writerow(r.get_row(columns))
-                        count += 1
+                if r['series'] in _RESERVED_SERIES or not r['refid']:
+                    continue
+                writerow(r.get_row(columns))
+                count += 1
         return count
 
     def update_cats(self, oldcat, newcat, notify=True):
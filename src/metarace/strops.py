@@ -8,26 +8,38 @@
 #	like DHI and track announce will be incorrect.
 
 import re
-from random import randint
+import zlib
+from functools import lru_cache
+from itertools import chain
+from random import randint, getrandbits
 import grapheme
 
 # replace codepoints 0->255 with space unless overridden
 # "protective" against unencoded ascii strings and control chars
-SPACEBLOCK = ''
-for i in range(0, 256):
-    SPACEBLOCK += chr(i)
+SPACEBLOCK = bytes(range(0, 256)).decode('latin-1')
 
 
 # unicode translation 'map' class
-class unicodetrans:
+class unicodetrans(dict):
+    """Translation table for str.translate.
+
+    Codepoints in replace are mapped to replacechar, codepoints in keep
+    are retained and all other codepoints are removed.
+    """
 
     def __init__(self, keep='', replace=SPACEBLOCK, replacechar=' '):
-        self.comp = dict((ord(c), replacechar) for c in replace)
+        super().__init__((ord(c), replacechar) for c in replace)
         for c in keep:
-            self.comp[ord(c)] = c
+            self[ord(c)] = c
+
+    def __missing__(self, k):  # remove codepoints not in table
+        return None
 
-    def __getitem__(self, k):  # override to return a None
-        return self.comp.get(k)
+
+def _bytetable(utrans):
+    """Return a bytes.translate table for a unicodetrans over 0-255."""
+    assert all(utrans[c] for c in range(0, 256))  # no deleted bytes
+    return bytes(ord(utrans[c]) for c in range(0, 256))
 
 
 INTEGER_UTRANS = unicodetrans('-0123456789')
@@ -45,23 +57,26 @@ BIBSERLIST_UTRANS = unicodetrans(
 WEBFILE_UTRANS = unicodetrans(
     '_0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz', '.',
     '_')
+# ASCII fast path tables
+_BIBLIST_BTRANS = _bytetable(BIBLIST_UTRANS)
+_BIBSERLIST_BTRANS = _bytetable(BIBSERLIST_UTRANS)
 # special case: map out controls, but keep everything else
-PRINT_UTRANS = {}
-for cp in range(0, 0x20):
-    PRINT_UTRANS[cp] = ' '
-for cp in range(0x7f, 0xa1):
-    PRINT_UTRANS[cp] = ' '
-PRINT_UTRANS[0x1680] = ' '
-PRINT_UTRANS[0x180e] = ' '
-PRINT_UTRANS[0x202f] = ' '
-PRINT_UTRANS[0x205f] = ' '
-PRINT_UTRANS[0x3000] = ' '
-PRINT_UTRANS[0xffa0] = ' '
+PRINT_UTRANS = dict.fromkeys(
+    chain(range(0, 0x20), range(0x7f, 0xa1),
+          (0x1680, 0x180e, 0x202f, 0x205f, 0x3000, 0xffa0)), ' ')
 
 # timing channels - this duplicates defs in timy
 CHAN_START = 0
 CHAN_INT = 9
 CHAN_UNKNOWN = -1
+_CHANSTRS = tuple('C' + str(i) for i in range(CHAN_START, CHAN_INT + 1))
+_CHANMAP = {}
+for _i in range(CHAN_START, CHAN_INT + 1):
+    for _f in (str(_i), 'C' + str(_i), 'C' + str(_i) + 'M', str(_i) + 'M'):
+        _CHANMAP[_f] = _i
+        _CHANMAP[_f.lower()] = _i
+del _i, _f
+_CHAN_RE = re.compile(r'[Cc]*(\d+)[Mm]*')
 
 # running number comparisons
 RUNNER_NOS = {
@@ -83,10 +98,49 @@ RUNNER_NOS = {
 
 DNFCODEMAP = {'otl': 0, 'dsq': 1, 'dnf': 3, 'dns': 4, '': 2}
 
+# rank/dnf code sort order: rank [rel] '' dsq hd|otl dnf dns
+_DNFORDMAP = {
+    'rel': 8000,
+    '': 8500,
+    'otl': 8800,
+    'dnf': 9000,
+    'dns': 9500,
+    'dsq': 10000,
+}
+# accept the usual spellings of each code without lower-casing
+_DNFCODEMAP = {
+    k: v
+    for c, v in _DNFORDMAP.items() for k in (c, c.upper(), c.title())
+}
+
+# ordinal suffixes, keyed by the last one or two digits of a place
+_ORDDIGIT = ('th', 'st', 'nd', 'rd', 'th', 'th', 'th', 'th', 'th', 'th')
+_ORDSUFFIX = {
+    k: 'th' if i // 10 == 1 else _ORDDIGIT[i % 10]
+    for i in range(0, 100) for k in (str(i), '%02d' % i)
+}
+
+# config strings considered True
+_TRUTHY = frozenset(('yes', 'true', '1'))
+
+# encircled draw numbers 1 - 10, with nbsp to get full line height
+_ENCIRC = {str(i): '\u00a0' + chr(0x245f + i) for i in range(1, 11)}
+
+# truncpad alignment format specs
+_ALIGNFMT = {'l': '<', 'r': '>', 'c': '^'}
+
+# place list range separators
+_DASH_SURROUND_RE = re.compile(r'\s*\-\s*')
+_DASH_DUPES_RE = re.compile(r'\-+')
+
+# canonical start lists
+_CANON_BIBLIST_RE = re.compile(r'[0-9A-Za-z]+(?: [0-9A-Za-z]+)*')
+_CANON_BIBSERLIST_RE = re.compile(r'[.0-9A-Za-z]+(?: [.0-9A-Za-z]+)*')
+
 
 def rand_key(data=None):
     """Return a random integer key for shuffling."""
-    return randint(0, 0xffffffff)
+    return getrandbits(32)
 
 
 def riderno_key(bib):
@@ -94,22 +148,16 @@ def riderno_key(bib):
     return bibstr_key(bib)
 
 
+@lru_cache(maxsize=1024)
 def dnfcode_key(code):
     """Return a rank/dnf code sorting key."""
-    # rank [rel] '' dsq hd|otl dnf dns
-    dnfordmap = {
-        'rel': 8000,
-        '': 8500,
-        'otl': 8800,
-        'dnf': 9000,
-        'dns': 9500,
-        'dsq': 10000,
-    }
     ret = 0
     if code is not None:
+        if code in _DNFCODEMAP:
+            return _DNFCODEMAP[code]
         code = code.lower()
-        if code in dnfordmap:
-            ret = dnfordmap[code]
+        if code in _DNFORDMAP:
+            ret = _DNFORDMAP[code]
         else:
             code = code.strip('.')
             if code.isdigit():
@@ -117,9 +165,10 @@ def dnfcode_key(code):
     return ret
 
 
+@lru_cache(maxsize=1024)
 def bibstr_key(bibstr=''):
     """Return a comparison key for sorting rider bib.ser strings."""
-    (bib, ser) = bibstr2bibser(bibstr)
+    (bib, ser) = bibstr2bibser(bibstr)  # bib is upper case
     bval = 0
     if bib.isdigit():
         bval = int(bib)
@@ -128,10 +177,9 @@ def bibstr_key(bibstr=''):
         if sbib and sbib.isdigit():
             bval = int(sbib)
         else:
-            if bib.upper()[0:3] in RUNNER_NOS:
-                bval = RUNNER_NOS[bib.upper()[0:3]]
-            else:
-                bval = id(bib)
+            bval = RUNNER_NOS.get(bib[0:3])
+            if bval is None:
+                bval = zlib.crc32(bib.encode('utf-8', 'surrogatepass'))
     sval = 0
     if ser != '':
         sval = ord(ser[0]) << 12
@@ -153,20 +201,42 @@ def promptstr(prompt='', value=''):
 
 def listsplit(liststr=''):
     """Return a split and stripped list."""
-    ret = []
-    for e in liststr.split(','):
-        ret.append(e.strip())
-    return ret
+    return [e.strip() for e in liststr.split(',')]
 
 
+@lru_cache(maxsize=256)
 def heatsplit(heatstr):
     """Return a failsafe heat/lane pair for the supplied heat string."""
-    hv = heatstr.split('.')
-    while len(hv) < 2:
-        hv.append('0')
-    return (riderno_key(hv[0]), riderno_key(hv[1]))
+    heat, sep, lane = heatstr.partition('.')
+    if sep:
+        lane = lane.partition('.')[0]
+    else:
+        lane = '0'
+    return (riderno_key(heat), riderno_key(lane))
+
+
+def _glen(src):
+    """Return the grapheme length of src, counting ASCII directly."""
+    if src.isascii() and '\r\n' not in src:
+        return len(src)
+    return grapheme.length(src)
+
 
+def _gslice(src, end):
+    """Return the first end graphemes of src, slicing ASCII directly."""
+    if src.isascii() and '\r\n' not in src:
+        return src[:end]
+    return grapheme.slice(src, end=end)
 
+
+def _joinlen(alen, blen):
+    """Return the length of two name parts joined with a space."""
+    if alen and blen:
+        return alen + blen + 1
+    return alen + blen
+
+
+@lru_cache(maxsize=2048)
 def fitname(first, last, width, trunc=False):
     """Return a truncated name string of width or less graphemes
        shortened to fit with priority:
@@ -178,98 +248,65 @@ def fitname(first, last, width, trunc=False):
           LASTNAME
           F. LAST...
     """
-    # Note: Use rider.fitname() for a caching version
-
     # Full name: 'Firstname FAMILY-LASTNAME'
-    ret = ''
     fn = first.strip().title()
-    fl = grapheme.length(fn)
+    fl = _glen(fn)
     ln = last.strip().upper()
-    ll = grapheme.length(ln)
-    flen = fl + ll
-    if fl and ll:
-        flen += 1
-    if flen > width:
+    ll = _glen(ln)
+    if _joinlen(fl, ll) > width:
         # Try without hyphen: 'Firstname LASTNAME'
-        lshrt = ln.split('-')[-1].strip()
-        lsl = grapheme.length(lshrt)
-        flen = fl + lsl
-        if fl and lsl:
-            flen += 1
-        if flen > width and ln:
-            if fl > 2:
-                # Retry with abbreviated firstname: 'F. FAMILY-LASTNAME'
-                fshrt = grapheme.slice(fn, end=1) + '.'
-                fn = fshrt
-                fsl = 2
-                flen = fsl + ll
-                if fsl and ll:
-                    flen += 1
-                if flen > width:
-                    # Retry without hyphenated lastname: 'F. LASTNAME'
-                    ln = lshrt
-                    flen = fsl + lsl
-                    if fsl and lsl:
-                        flen += 1
-                    if flen > width:
-                        # Retry with only lastname: 'LASTNAME'
-                        if lsl <= width:
-                            fn = ''
-        else:
+        lshrt = ln.rpartition('-')[2].strip()
+        lsl = _glen(lshrt)
+        if _joinlen(fl, lsl) <= width or not ln:
             ln = lshrt
+        elif fl > 2:
+            # Retry with abbreviated firstname: 'F. FAMILY-LASTNAME'
+            fn = _gslice(fn, 1) + '.'
+            if _joinlen(2, ll) > width:
+                # Retry without hyphenated lastname: 'F. LASTNAME'
+                ln = lshrt
+                if _joinlen(2, lsl) > width and lsl <= width:
+                    # Retry with only lastname: 'LASTNAME'
+                    fn = ''
     if fn and ln:
-        ret = ' '.join((fn, ln))
-    elif fn:
-        ret = fn
+        ret = fn + ' ' + ln
     else:
-        ret = ln
-    if trunc and grapheme.length(ret) > width:
+        ret = fn or ln
+    if trunc and _glen(ret) > width:
         if width > 4:
-            ret = grapheme.slice(ret, end=width - 1) + '\u2026'
+            ret = _gslice(ret, width - 1) + '\u2026'
         else:
-            ret = grapheme.slice(ret, end=width)
+            ret = _gslice(ret, width)
     return ret
 
 
 def drawno_encirc(drawstr=''):
     ret = ''
     try:
-        if drawstr.isdigit():
+        if drawstr in _ENCIRC:
+            ret = _ENCIRC[drawstr]
+        elif drawstr.isdigit():
             ret = drawstr
             ival = int(drawstr)
             if ival > 0 and ival <= 10:
-                ret = (
-                    '\u00a0' +  # nbsp to get full line height
-                    chr(0x245f + ival))  # CP U+2460 "Circled digit"
+                ret = _ENCIRC[str(ival)]
     except Exception:
         pass
     return ret
 
 
+@lru_cache(maxsize=1024)
 def rank2ord(place):
     """Return ordinal for the given place."""
-    omap = {
-        '1': 'st',
-        '2': 'nd',
-        '3': 'rd',
-        '11': 'th',
-        '12': 'th',
-        '13': 'th'
-    }
     ret = place
     if place.isdigit():
-        if place in omap:
-            ret = place + omap[place]
-        elif len(place) > 1 and place[-2:] in omap:
-            ret = place + omap[place[-2:]]
-        else:
-            if len(place) > 1 and place[-1] in omap:  # last digit 1,2,3
-                ret = place + omap[place[-1]]
-            else:
-                ret = place + 'th'
+        # non-ASCII digits miss the table, so retry on the last digit
+        ret = place + (_ORDSUFFIX.get(place[-2:])
+                       or _ORDSUFFIX.get(place[-1:], 'th'))
     return ret
 
 
+@lru_cache(maxsize=1024)
 def rank2int(rank):
     """Convert a rank/placing string into an integer."""
     ret = None
@@ -298,24 +335,17 @@ def mark2int(handicap):
 
 def truncpad(srcline, width, align='l', ellipsis=True):
     """Return srcline truncated and padded to width aligned graphemes"""
-    curlen = grapheme.length(srcline)
+    curlen = _glen(srcline)
     if curlen > width:
         # truncation
         if ellipsis and width > 4:
-            ret = grapheme.slice(srcline, end=width - 1) + '\u2026'
+            ret = _gslice(srcline, width - 1) + '\u2026'
         else:
-            ret = grapheme.slice(srcline, end=width)
+            ret = _gslice(srcline, width)
     elif curlen < width:
-        # padding
-        residual = width - curlen
-        if align == 'r':
-            ret = ' ' * residual + srcline
-        elif align == 'c':
-            prelen = residual // 2
-            postlen = residual - prelen
-            ret = ' ' * prelen + srcline + ' ' * postlen
-        else:
-            ret = srcline + ' ' * residual
+        # padding: format pads by codepoints, so widen by the residual
+        padlen = len(srcline) + width - curlen
+        ret = format(srcline, _ALIGNFMT.get(align, '<') + str(padlen))
     else:
         ret = srcline
     return ret
@@ -323,22 +353,21 @@ def truncpad(srcline, width, align='l', ellipsis=True):
 
 def resname_bib(bib, first, last, club, series=''):
     """Return rider name formatted for results with bib."""
-    bibstr = bibser2bibstr(bib, series)
-    ret = [bibstr, ' ', fitname(first, last, 64)]
+    ret = bibser2bibstr(bib, series) + ' ' + fitname(first, last, 64)
     if club is not None and club != '':
-        if len(club) < 4:
+        if len(club) < 4 and not club.isupper():
             club = club.upper()
-        ret.extend([' (', club, ')'])
-    return ''.join(ret)
+        ret += ' (' + club + ')'
+    return ret
 
 
 def resname(first, last=None, club=None):
     """Return rider name formatted for results."""
     ret = fitname(first, last, 64)
     if club is not None and club != '':
-        if len(club) < 4:
+        if len(club) < 4 and not club.isupper():
             club = club.upper()
-        ret = ''.join([ret, ' (', club, ')'])
+        ret += ' (' + club + ')'
     return ret
 
 
@@ -346,14 +375,25 @@ def listname(first, last=None, club=None):
     """Return a rider name summary field for non-edit lists."""
     ret = fitname(first, last, 32)
     if club:
-        if len(club) < 4:
+        if len(club) < 4 and not club.isupper():
             club = club.upper()
-        ret = ''.join([ret, ' (', club, ')'])
+        ret += ' (' + club + ')'
     return ret
 
 
+def _reformat_ascii(srcstr, btable):
+    """Filter an ASCII string through btable and rejoin on single spaces."""
+    return b' '.join(srcstr.encode('ascii').translate(btable).split()).decode(
+        'ascii')
+
+
+@lru_cache(maxsize=1024)
 def reformat_bibserlist(bibserstr):
     """Filter and return a bib.ser start list."""
+    if _CANON_BIBSERLIST_RE.fullmatch(bibserstr):
+        return bibserstr  # already clean
+    if bibserstr.isascii():
+        return _reformat_ascii(bibserstr, _BIBSERLIST_BTRANS)
     return ' '.join(bibserstr.translate(BIBSERLIST_UTRANS).split())
 
 
@@ -363,13 +403,18 @@ def reformat_bibserplacelist(placestr):
         return reformat_bibserlist(placestr)
     # otherwise, do the hard substitutions...
     placestr = placestr.translate(PLACESERLIST_UTRANS).strip()
-    placestr = re.sub(r'\s*\-\s*', r'-', placestr)  # remove surrounds
-    placestr = re.sub(r'\-+', r'-', placestr)  # combine dupes
+    placestr = _DASH_SURROUND_RE.sub('-', placestr)  # remove surrounds
+    placestr = _DASH_DUPES_RE.sub('-', placestr)  # combine dupes
     return ' '.join(placestr.strip('-').split())
 
 
+@lru_cache(maxsize=1024)
 def reformat_biblist(bibstr):
     """Filter and return a canonically formatted start list."""
+    if _CANON_BIBLIST_RE.fullmatch(bibstr):
+        return bibstr  # already clean
+    if bibstr.isascii():
+        return _reformat_ascii(bibstr, _BIBLIST_BTRANS)
     return ' '.join(bibstr.translate(BIBLIST_UTRANS).split())
 
 
@@ -384,15 +429,15 @@ def riderlist_split(riderstr, rdb=None, series=''):
         catnames = rdb.listcats(series)
         for r in riderstr.split():
             if r == 'ALL':
-                for rid in rdb.biblistfromseries(series):
-                    bib, ser = bibstr2bibser(rid)
-                    if ser == series:
-                        dstlist.append(bib)
+                dstlist.extend(
+                    bib for bib, ser in map(bibstr2bibser,
+                                            rdb.biblistfromseries(series))
+                    if ser == series)
             elif r in catnames:
-                for rid in rdb.biblistfromcat(r, series):
-                    bib, ser = bibstr2bibser(rid)
-                    if ser == series:
-                        dstlist.append(bib)
+                dstlist.extend(
+                    bib for bib, ser in map(bibstr2bibser,
+                                            rdb.biblistfromcat(r, series))
+                    if ser == series)
             else:
                 srclist.append(r)
         riderstr = ' '.join(srclist)
@@ -410,10 +455,7 @@ def riderlist_split(riderstr, rdb=None, series=''):
                         start = int(l)
                         end = int(r)
                         if start < end:
-                            c = start
-                            while c < end:
-                                dstlist.append(str(c))
-                                c += 1
+                            dstlist.extend(map(str, range(start, end)))
                         else:
                             dstlist.append(l)
                     else:
@@ -427,13 +469,8 @@ def riderlist_split(riderstr, rdb=None, series=''):
         else:
             dstlist.append(nr)
 
-    ret = []
-    rset = set()
-    for r in dstlist:
-        if r not in rset:
-            ret.append(r)
-            rset.add(r)
-    return ret
+    # remove duplicates, retaining order
+    return list(dict.fromkeys(dstlist))
 
 
 def placeset(spec=''):
@@ -444,11 +481,14 @@ def placeset(spec=''):
     #       eg: sprint semi -> sprint final, the auto spec is: 3,1,2,4
     #       so the 'winners' go to the gold final and the losers to the
     #       bronze final.
-    ret = []
     spec = reformat_placelist(spec)
+    if '-' not in spec:
+        # no ranges: filter, convert and remove duplicates in one pass
+        return list(dict.fromkeys(int(i) for i in spec.split() if i.isdigit()))
+    ret = []
     # pass 1: expand ranges
     for nr in spec.split():
-        if '-' in spec:
+        if '-' in nr:
             # try for a range...
             l = None
             n = None
@@ -458,10 +498,7 @@ def placeset(spec=''):
                         start = int(l)
                         end = int(r)
                         if start < end:
-                            c = start
-                            while c < end:
-                                ret.append(str(c))
-                                c += 1
+                            ret.extend(map(str, range(start, end)))
                         else:
                             ret.append(l)  # give up on last val
                     else:
@@ -476,10 +513,12 @@ def placeset(spec=''):
             ret.append(nr)
     # pass 2: filter out non-numbers, only places considered
     rset = []
+    seen = set()
     for i in ret:
         if i.isdigit():
             ival = int(i)
-            if ival not in rset:
+            if ival not in seen:
+                seen.add(ival)
                 rset.append(ival)
     return rset
 
@@ -489,28 +528,24 @@ def reformat_placelist(placestr):
     if '-' not in placestr:
         return reformat_biblist(placestr)
     placestr = placestr.translate(PLACELIST_UTRANS).strip()
-    placestr = re.sub(r'\s*\-\s*', r'-', placestr)  # remove surrounds
-    placestr = re.sub(r'\-+', r'-', placestr)  # combine dupes
+    placestr = _DASH_SURROUND_RE.sub('-', placestr)  # remove surrounds
+    placestr = _DASH_DUPES_RE.sub('-', placestr)  # combine dupes
     return ' '.join(placestr.strip('-').split())
 
 
 def confopt_bool(confstr):
     """Check and return a boolean option from config."""
+    if not confstr:
+        return False
     if isinstance(confstr, str):
-        if confstr.lower() in ['yes', 'true', '1']:
-            return True
-        else:
-            return False
+        return confstr.lower() in _TRUTHY
     else:
         return bool(confstr)
 
 
 def plural(count=0):
     """Return plural extension for provided count."""
-    ret = 's'
-    if count == 1:
-        ret = ''
-    return ret
+    return '' if count == 1 else 's'
 
 
 def confopt_str(confob, default=None):
@@ -521,8 +556,11 @@ def confopt_str(confob, default=None):
     return ret
 
 
+@lru_cache(maxsize=1024)
 def confopt_riderno(confstr, default=''):
     """Check and return rider number, filtered only."""
+    if confstr.isascii() and confstr.isalnum():
+        return confstr  # already clean
     return confstr.translate(RIDERNO_UTRANS).strip()
 
 
@@ -576,12 +614,14 @@ def chan2id(chanstr='0'):
     ret = CHAN_UNKNOWN
     try:
         if isinstance(chanstr, str):
-            chanstr = chanstr.upper().rstrip('M').lstrip('C')
-            if chanstr.isdigit():
-                ret = int(chanstr)
+            if chanstr in _CHANMAP:
+                return _CHANMAP[chanstr]
+            m = _CHAN_RE.fullmatch(chanstr)
+            if m is not None:
+                ret = int(m.group(1))
         else:
             ret = int(chanstr)
-    except Exception as e:
+    except (TypeError, ValueError, OverflowError):
         pass
     if ret < CHAN_UNKNOWN or ret > CHAN_INT:
         ret = CHAN_UNKNOWN
@@ -592,7 +632,7 @@ def id2chan(chanid=0):
     """Return a normalised channel string for the provided channel id."""
     ret = 'C?'
     if isinstance(chanid, int) and chanid >= CHAN_START and chanid <= CHAN_INT:
-        ret = 'C' + str(chanid)
+        ret = _CHANSTRS[chanid]
     return ret
 
 
@@ -621,16 +661,12 @@ def confopt_list(confstr, list=[], default=None):
     return ret
 
 
+@lru_cache(maxsize=1024)
 def bibstr2bibser(bibstr=''):
     """Split a bib.series string and return bib and series."""
-    a = bibstr.strip().split('.')
-    ret_bib = ''
-    ret_ser = ''
-    if len(a) > 0:
-        ret_bib = a[0].upper()
-    if len(a) > 1:
-        ret_ser = a[1].lower()
-    return (ret_bib, ret_ser)
+    bib, sep, ser = bibstr.strip().partition('.')
+    ser = ser.partition('.')[0]  # ignore any further components
+    return (bib.upper(), ser.lower())
 
 
 def lapstring(lapcount=None):
@@ -652,20 +688,23 @@ def bibser2bibstr(bib='', ser=''):
 
 def titlesplit(src='', linelen=24):
     """Split a string on word boundaries to try and fit into 3 fixed lines."""
-    ret = ['', '', '']
+    lines = [[], [], []]
     words = src.split()
-    wlen = len(words)
-    if wlen > 0:
+    if words:
         line = 0
-        ret[line] = words.pop(0)
-        for word in words:
-            pos = len(ret[line])
-            if pos + len(word) >= linelen:
+        cur = lines[0]
+        cur.append(words[0])
+        pos = len(words[0])
+        for word in words[1:]:
+            wlen = len(word)
+            if pos + wlen >= linelen:
                 # new line
                 line += 1
                 if line > 2:
                     break
-                ret[line] = word
+                cur = lines[line]
+                pos = wlen
             else:
-                ret[line] += ' ' + word
-    return ret
+                pos += wlen + 1
+            cur.append(word)
+    return [' '.join(l) for l in lines]
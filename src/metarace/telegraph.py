@@ -28,6 +28,10 @@
  to convert a message from json into a python object. See defcallback
  for an example.
 
+ Callbacks for specific topic filters may be added with
+ setcb(func, topic). Messages matching a topic callback are passed to it
+ instead of the main callback.
+
  Configuration is via metarace system config (metarace.json), under
  section 'telegraph':
 
@@ -52,11 +56,10 @@ import queue
 import logging
 import json
 import paho.mqtt.client as mqtt
+from functools import lru_cache
 from uuid import uuid4
 import metarace
 
-QUEUE_TIMEOUT = 2
-
 # module logger
 _log = logging.getLogger('telegraph')
 _log.setLevel(logging.DEBUG)
@@ -146,6 +149,17 @@ def from_json(payload=None):
     return ret
 
 
+@lru_cache(maxsize=32)
+def _json_encoder(cls=None, indent=None):
+    """Return a shared JSON encode method for the provided options."""
+    if cls is None:
+        cls = json.JSONEncoder
+    separators = None
+    if indent is None:
+        separators = (',', ':')
+    return cls(indent=indent, separators=separators).encode
+
+
 def defcallback(topic=None, message=None):
     """Default message receive callback function."""
     ob = from_json(message)
@@ -161,6 +175,8 @@ class telegraph(threading.Thread):
     def subscribe(self, topic=None, qos=None):
         """Add topic to the set of subscriptions with optional qos."""
         if topic:
+            if qos is None:
+                qos = self.__qos
             self.__subscriptions[topic] = qos
             if self.__connected:
                 self.__queue.put_nowait(('SUBSCRIBE', topic, qos))
@@ -172,9 +188,20 @@ class telegraph(threading.Thread):
             if self.__connected:
                 self.__queue.put_nowait(('UNSUBSCRIBE', topic))
 
-    def setcb(self, func=None):
-        """Set the message receive callback function."""
-        if func is not None:
+    def setcb(self, func=None, topic=None):
+        """Set the message receive callback function.
+
+        If topic is provided, func is called only for messages that
+        match the topic filter, other messages are passed to the main
+        callback. Set func to None to remove a topic callback.
+        """
+        if topic is not None:
+            if func is not None:
+                self.__client.message_callback_add(topic,
+                                                   self.__topic_cb(func))
+            else:
+                self.__client.message_callback_remove(topic)
+        elif func is not None:
             self.__cb = func
         else:
             self.__cb = defcallback
@@ -190,7 +217,7 @@ class telegraph(threading.Thread):
     def set_will_json(self, obj=None, topic=None, qos=None, retain=False):
         """Pack the provided object into JSON and set as will."""
         try:
-            self.set_will(json.dumps(obj), topic, qos, retain)
+            self.set_will(_json_encoder()(obj), topic, qos, retain)
         except Exception as e:
             _log.error('Error setting will object %r: %s', obj, e)
 
@@ -230,7 +257,13 @@ class telegraph(threading.Thread):
         self.__queue.join()
 
     def publish(self, message=None, topic=None, qos=None, retain=False):
-        """Publish the provided message to topic."""
+        """Publish the provided str or bytes message to topic."""
+        if isinstance(message, str):
+            try:
+                message = message.encode('utf-8')
+            except Exception as e:
+                _log.error('Error publishing message %r: %s', message, e)
+                return
         self.__queue.put_nowait(('PUBLISH', topic, message, qos, retain))
 
     def publish_json(self,
@@ -240,10 +273,16 @@ class telegraph(threading.Thread):
                      retain=False,
                      cls=None,
                      indent=None):
-        """Pack the provided object into JSON and publish to topic."""
+        """Pack the provided object into JSON and publish to topic.
+
+        Payloads already serialised to bytes are published unchanged.
+        """
         try:
-            self.publish(json.dumps(obj, cls=cls, indent=indent), topic, qos,
-                         retain)
+            if isinstance(obj, (bytes, bytearray)):
+                self.publish(bytes(obj), topic, qos, retain)
+            else:
+                self.publish(_json_encoder(cls, indent)(obj), topic, qos,
+                             retain)
         except Exception as e:
             _log.error('Error publishing object %r: %s', obj, e)
 
@@ -330,15 +369,9 @@ class telegraph(threading.Thread):
                            client._client_id)
             else:
                 _log.debug('Assuming Clean session for %r', client._client_id)
-                s = []
-                for t in self.__subscriptions:
-                    nqos = self.__subscriptions[t]
-                    if nqos is None:
-                        nqos = self.__qos
-                    s.append((t, nqos))
-                if len(s) > 0:
-                    _log.debug('Subscribe topics: %r', s)
-                    self.__client.subscribe(s)
+                s = list(self.__subscriptions.items())
+                if s:
+                    self.__subscribe(s)
                 self.__resub = False
             self.__connected = True
         else:
@@ -352,6 +385,13 @@ class telegraph(threading.Thread):
         self.__connected = False
         # Note: PAHO lib will attempt re-connection automatically
 
+    def __topic_cb(self, func):
+
+        def cb(client, userdata, message):
+            func(topic=message.topic, message=message.payload.decode('utf-8'))
+
+        return cb
+
     def __on_message(self, client, userdata, message):
         #_log.debug(u'Message from %r: %r', client._client_id, message)
         self.__cb(topic=message.topic, message=message.payload.decode('utf-8'))
@@ -363,6 +403,15 @@ class telegraph(threading.Thread):
             _log.debug('Starting')
         else:
             _log.debug('Not connected')
+        get = self.__queue.get
+        get_nowait = self.__queue.get_nowait
+        task_done = self.__queue.task_done
+        handlers = {
+            'PUBLISH': self.__do_publish,
+            'UNSUBSCRIBE': self.__do_unsubscribe,
+            'RECONNECT': self.__do_reconnect,
+            'EXIT': self.__do_exit,
+        }
         while self.__running:
             try:
                 # Check connection status
@@ -370,42 +419,30 @@ class telegraph(threading.Thread):
                     self.__doreconnect = False
                     if not self.__connect_pending:
                         self.__reconnect()
-                # Process command queue
-                while self.__running:
-                    m = self.__queue.get(timeout=QUEUE_TIMEOUT)
-                    self.__queue.task_done()
-                    if m[0] == 'PUBLISH':
-                        ntopic = self.__deftopic
-                        if m[1] is not None:  # topic is set
-                            ntopic = m[1]
-                        nqos = m[3]
-                        if nqos is None:
-                            nqos = self.__qos
-                        if ntopic:
-                            msg = None
-                            if m[2] is not None:
-                                msg = m[2].encode('utf-8')
-                            self.__client.publish(ntopic, msg, nqos, m[4])
-                        else:
-                            #_log.debug(u'No topic, msg ignored: %r', m[1])
-                            pass
-                    elif m[0] == 'SUBSCRIBE':
-                        _log.debug('Subscribe topic: %r q=%r', m[1], m[2])
-                        nqos = m[2]
-                        if nqos is None:
-                            nqos = self.__qos
-                        self.__client.subscribe(m[1], nqos)
-                    elif m[0] == 'UNSUBSCRIBE':
-                        _log.debug('Un-subscribe topic: %r', m[1])
-                        self.__client.unsubscribe(m[1])
-                    elif m[0] == 'RECONNECT':
-                        self.__connect_pending = False
-                        self.__doreconnect = True
-                    elif m[0] == 'EXIT':
-                        _log.debug('Request to close: %r', m[1])
-                        self.__running = False
-            except queue.Empty:
-                pass
+                # Wait for commands, then drain the queue
+                m = get()
+                task_done()
+                # collect adjacent subscribes into one request
+                subs = []
+                while m is not None:
+                    if m[0] == 'SUBSCRIBE':
+                        subs.append((m[1], m[2]))  # qos resolved on entry
+                    else:
+                        if subs:
+                            self.__subscribe(subs)
+                            subs = []
+                        handler = handlers.get(m[0])
+                        if handler is not None:
+                            handler(m)
+                        if not self.__running:
+                            break
+                    try:
+                        m = get_nowait()
+                        task_done()
+                    except queue.Empty:
+                        m = None
+                if subs:
+                    self.__subscribe(subs)
             except Exception as e:
                 _log.error('%s: %s', e.__class__.__name__, e)
                 self.__connect_pending = False
@@ -414,3 +451,40 @@ class telegraph(threading.Thread):
             self.__client.disconnect()
             self.__client.loop_stop()
         _log.info('Exiting')
+
+    def __subscribe(self, subs):
+        _log.debug('Subscribe topics: %r', subs)
+        try:
+            self.__client.subscribe(subs)
+        except ValueError:
+            # paho rejects the whole list for one bad topic or qos
+            for sub in subs:
+                try:
+                    self.__client.subscribe(*sub)
+                except ValueError as e:
+                    _log.error('Error subscribing to %r: %s', sub, e)
+
+    def __do_publish(self, m):
+        ntopic = self.__deftopic
+        if m[1] is not None:  # topic is set
+            ntopic = m[1]
+        nqos = m[3]
+        if nqos is None:
+            nqos = self.__qos
+        if ntopic:
+            self.__client.publish(ntopic, m[2], nqos, m[4])
+        else:
+            #_log.debug(u'No topic, msg ignored: %r', m[1])
+            pass
+
+    def __do_unsubscribe(self, m):
+        _log.debug('Un-subscribe topic: %r', m[1])
+        self.__client.unsubscribe(m[1])
+
+    def __do_reconnect(self, m):
+        self.__connect_pending = False
+        self.__doreconnect = True
+
+    def __do_exit(self, m):
+        _log.debug('Request to close: %r', m[1])
+        self.__running = False